@@ -3,54 +3,106 @@
 from __future__ import print_function
 import sys
 import os
+import math
 import threading
 import time
 import numpy as np
-from PySide import QtGui, QtCore
+try:
+    from PySide6 import QtCore, QtGui, QtWidgets
+    from PySide6.QtGui import QAction, QActionGroup
+except ImportError:
+    try:
+        from PySide2 import QtCore, QtGui, QtWidgets
+        from PySide2.QtWidgets import QAction, QActionGroup
+    except ImportError:
+        from PyQt5 import QtCore, QtGui, QtWidgets
+        from PyQt5.QtWidgets import QAction, QActionGroup
 from . import utils
 from . import input
 from . import _ember
 
-import matplotlib
-matplotlib.rcParams['backend.qt4'] = 'PySide'
-matplotlib.use('Qt4Agg')
-from matplotlib.backends.backend_qt4agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+try:
+    from fastrlock.rlock import FastRLock as _SolverLock
+except ImportError:
+    _SolverLock = threading.Lock
 
 if sys.version_info.major == 3:
     _stringTypes = (str,)
 else:
     _stringTypes = (str, unicode)
 
+def _paddedRange(lo, hi, margin=0.05):
+    pad = margin * (hi - lo) or margin * abs(hi) or 1.0
+    return lo - pad, hi + pad
+
 class SolverThread(threading.Thread):
+    """
+    Thread used to advance the solver while the GUI remains responsive.
+    FlameSolver.step releases the GIL while the C++ solver runs, so stepping
+    in this thread doesn't hold up the Qt event loop.
+    """
     def __init__(self, *args, **kwargs):
         threading.Thread.__init__(self)
         self.solver = kwargs['solver']
         self.conf = kwargs['conf'].evaluate()
-        self.solver.lock = threading.Lock()
+        self.solver.lock = _SolverLock()
         self.solver.progress = 0.0
-        self.__stop = False
+        self._stopEvent = threading.Event()
         self.daemon = True
         self.stage = 0
 
         self.frac0 = 0.15
+        self.batchDuration = 5e-3 # target wall time [s] for each batch of steps
+
+        # Rows are time [ms] and consumption speed [cm/s], in the units used
+        # for plotting. The filled part is published as self.timeseries.
+        self._timeseries = np.empty((2, 256))
+        self._timeseriesSize = 0
+        self.updateTimeseries()
 
     def run(self):
         done = 0
-        i = 0
-        while not self.__stop and not done:
-            i += 1
+        while not done and not self._stopEvent.is_set():
+            # Take as many steps as fit in batchDuration before releasing the
+            # lock, rather than acquiring it separately for each step
             with self.solver.lock:
-                done = self.solver.step()
-            time.sleep(1e-3)
-            if not i % 5:
-                self.updateProgress()
+                tStart = time.time()
+                while not done and time.time() - tStart < self.batchDuration:
+                    done = self.solver.step()
+            self.updateTimeseries()
+            self.updateProgress()
             if done:
                 self.solver.progress = 1.0
-        self.__stop = True
+            elif self._stopEvent.wait(1e-4):
+                # Waiting briefly also gives up the lock so the GUI can update
+                # the plots, and returns immediately if stop() is called
+                break
+        self._stopEvent.set()
 
     def stop(self):
-        self.__stop = True
+        self._stopEvent.set()
+
+    def updateTimeseries(self):
+        """
+        Copy points added to the solver's time series since the last call into
+        an array that the GUI can read as *timeseries* without holding the
+        solver lock. Values are converted to the units used for plotting.
+        """
+        writer = self.solver.timeseriesWriter
+        n0 = self._timeseriesSize
+        n1 = len(writer.t)
+        if n1 > self._timeseries.shape[1]:
+            data = np.empty((2, max(n1, 2 * self._timeseries.shape[1])))
+            data[:,:n0] = self._timeseries[:,:n0]
+            self._timeseries = data
+
+        self._timeseries[0,n0:n1] = writer.t[n0:n1]
+        self._timeseries[1,n0:n1] = writer.Sc[n0:n1]
+        self._timeseries[:,n0:n1] *= ((1000,), (100,))
+        self._timeseriesSize = n1
+
+        # Points after n1 may be written later, but the GUI only sees this view
+        self.timeseries = self._timeseries[:,:n1]
 
     def updateProgress(self):
         TC = self.conf.terminationCondition
@@ -62,38 +114,49 @@ class SolverThread(threading.Thread):
             self.solver.progress = self.frac0 * self.solver.timeseriesWriter.t[-1] / TC.steadyPeriod
             if errNow < 1e9:
                 self.refCond = errNow
+                self.invLogTol = 1.0 / math.log10(TC.tolerance)
                 self.stage = 1
         else:
-            # Second part: vaguely linearizing the approach to steady-state
-            A = (np.log10(TC.tolerance + (errNow-TC.tolerance)/self.refCond) /
-                 np.log10(TC.tolerance))
-            P = min(self.frac0 + (1-self.frac0) * A ** 0.5 , 1.0)
+            # Second part: vaguely linearizing the approach to steady-state.
+            # Clipping keeps A in [0, 1] when errNow is outside [tolerance, refCond]
+            e = TC.tolerance + (errNow-TC.tolerance)/self.refCond
+            A = math.log10(min(max(e, TC.tolerance), 1.0)) * self.invLogTol
+            P = min(self.frac0 + (1-self.frac0) * math.sqrt(A), 1.0)
             self.solver.progress = max(P, self.solver.progress) # never go backwards
 
-class OptionWidget(QtGui.QWidget):
+class OptionWidget(QtWidgets.QWidget):
     def __init__(self, label, opt, *args, **kwargs):
-        QtGui.QWidget.__init__(self)
+        QtWidgets.QWidget.__init__(self)
 
         self.opt = opt
         self.label = label
         self.optName = self.label.text()
-        self.setLayout(QtGui.QHBoxLayout())
+        self.setLayout(QtWidgets.QHBoxLayout())
         self.layout().setContentsMargins(0,0,0,0)
+        self._isItalic = None
 
     def updateOpt(self):
-        if self.opt.value != self.opt.default:
+        self.checkDefault()
+        self.parent().parent().updateVisibility()
+
+    def checkDefault(self):
+        """ Italicize the label if the option has a non-default value """
+        italic = self.opt.value != self.opt.default
+        if italic == self._isItalic:
+            return # avoid re-parsing and laying out the label text
+        self._isItalic = italic
+        if italic:
             self.label.setText('<i>%s</i>' %  self.optName)
         else:
             self.label.setText('%s' %  self.optName)
-        self.parent().parent().updateVisibility()
 
 
 class StringOptionWidget(OptionWidget):
     def __init__(self, label, opt, *args, **kwargs):
         OptionWidget.__init__(self, label, opt)
-        self.text = QtGui.QLineEdit(opt.value)
+        self.text = QtWidgets.QLineEdit(opt.value)
         self.layout().addWidget(self.text)
-        self.text.textChanged.connect(self.updateOpt)
+        self.text.editingFinished.connect(self.updateOpt)
 
     def updateOpt(self):
         self.opt.value = str(self.text.text())
@@ -103,9 +166,9 @@ class StringOptionWidget(OptionWidget):
 class NumericOptionWidget(OptionWidget):
     def __init__(self, label, opt, *args, **kwargs):
         OptionWidget.__init__(self, label, opt)
-        self.text = QtGui.QLineEdit(str(opt.value))
+        self.text = QtWidgets.QLineEdit(str(opt.value))
         self.layout().addWidget(self.text)
-        self.text.textChanged.connect(self.updateOpt)
+        self.text.editingFinished.connect(self.updateOpt)
 
     def updateOpt(self):
         try:
@@ -128,9 +191,9 @@ class BoolOptionWidget(OptionWidget):
     def __init__(self, label, opt, *args, **kwargs):
         OptionWidget.__init__(self, label, opt)
 
-        self.trueWidget = QtGui.QRadioButton('True')
-        self.falseWidget = QtGui.QRadioButton('False')
-        self.noneWidget = QtGui.QRadioButton('None')
+        self.trueWidget = QtWidgets.QRadioButton('True')
+        self.falseWidget = QtWidgets.QRadioButton('False')
+        self.noneWidget = QtWidgets.QRadioButton('None')
         if opt.value:
             self.trueWidget.toggle()
         else:
@@ -166,7 +229,7 @@ class EnumOptionWidget(OptionWidget):
     def __init__(self, label, opt, *args, **kwargs):
         OptionWidget.__init__(self, label, opt)
 
-        self.combo = QtGui.QComboBox()
+        self.combo = QtWidgets.QComboBox()
         self.items = {}
         for i,choice in enumerate(opt.choices):
             if choice == opt.value:
@@ -184,24 +247,25 @@ class EnumOptionWidget(OptionWidget):
         OptionWidget.updateOpt(self)
 
 
-class OptionsWidget(QtGui.QGroupBox):
+class OptionsWidget(QtWidgets.QGroupBox):
     def __init__(self, opts, *args, **kwargs):
-        QtGui.QGroupBox.__init__(self)
+        QtWidgets.QGroupBox.__init__(self)
         self.opts = opts
-        self.setLayout(QtGui.QGridLayout())
-        self.layout().setSpacing(0)
+        self.setLayout(QtWidgets.QFormLayout())
+        self.layout().setHorizontalSpacing(5)
+        self.layout().setVerticalSpacing(4)
+        self.layout().setFormAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop)
+        self.layout().setFieldGrowthPolicy(
+            QtWidgets.QFormLayout.AllNonFixedFieldsGrow)
         self.setTitle(self.opts.__class__.__name__)
         self.optionWidgets = []
 
-        width = 0
-        for i,(name,opt) in enumerate(self.opts):
+        for name,opt in self.opts:
             if opt.label:
-                label = QtGui.QLabel(opt.label)
+                label = QtWidgets.QLabel(opt.label)
                 label.setToolTip('<tt>%s</tt>' % name)
             else:
-                label = QtGui.QLabel(name)
-            self.layout().addWidget(label, i, 0)
-            width = max(label.sizeHint().width(), width)
+                label = QtWidgets.QLabel(name)
 
             if opt.choices is not None:
                 w = EnumOptionWidget(label, opt)
@@ -214,17 +278,23 @@ class OptionsWidget(QtGui.QGroupBox):
             elif isinstance(opt, input.BoolOption):
                 w = BoolOptionWidget(label, opt)
             else:
-                w = QtGui.QLabel(str(opt.value))
+                w = QtWidgets.QLabel(str(opt.value))
                 w.opt = opt
 
-            self.layout().addWidget(w, i, 1)
+            self.layout().addRow(label, w)
             self.optionWidgets.append((label,w))
 
-        self.layout().setVerticalSpacing(4)
-        self.layout().setColumnMinimumWidth(0, width + 5)
-        spacer = QtGui.QSpacerItem(1, 1000, QtGui.QSizePolicy.Minimum,
-                                   QtGui.QSizePolicy.Maximum)
-        self.layout().addItem(spacer, i+1, 0)
+    @staticmethod
+    def checkVisibility(opts, level, conf):
+        """
+        Returns a tuple indicating whether any of the options in *opts* are
+        visible at *level*, and whether any of the visible options are enabled
+        for the configuration *conf*. Used for sections whose widgets haven't
+        been created; updateVisibility applies the same rule to its widgets.
+        """
+        shown = [opt for name,opt in opts if opt.level <= level]
+        anyEnabled = any(opt.shouldBeEnabled(conf) for opt in shown)
+        return bool(shown), anyEnabled
 
     def updateVisibility(self, level, conf):
         anyVisible = False
@@ -245,69 +315,89 @@ class OptionsWidget(QtGui.QGroupBox):
         return anyVisible, anyEnabled
 
 
-class MultiOptionsWidget(QtGui.QWidget):
+class MultiOptionsWidget(QtWidgets.QWidget):
     """ Widget used for presenting solver configuration options """
     def __init__(self, conf, *args, **kwargs):
-        QtGui.QWidget.__init__(self)
+        QtWidgets.QWidget.__init__(self)
         self.conf = conf
-        self.setLayout(QtGui.QHBoxLayout())
-        self.optionsList = QtGui.QListWidget()
+        self.setLayout(QtWidgets.QHBoxLayout())
+        self.optionsList = QtWidgets.QListWidget()
         self.optionsList.setSpacing(1)
         self.layout().addWidget(self.optionsList)
         self.activeOptionWidget = None
-        self.optionWidgets = []
+        self.listItems = []
         self.level = 0
 
+        # The OptionsWidget for each section is created the first time that
+        # section is shown, so the minimum height is estimated from the
+        # number of options (plus the group box title) in each section.
+        rowHeight = QtWidgets.QLineEdit().sizeHint().height() + 4
         height = 0
         for item in self.conf:
-            listitem = QtGui.QListWidgetItem(item.__class__.__name__)
+            listitem = QtWidgets.QListWidgetItem(item.__class__.__name__)
             self.optionsList.addItem(listitem)
-            w = OptionsWidget(item)
-            self.optionWidgets.append((listitem,w))
-            height = max(height, w.minimumSizeHint().height())
-            listitem.widget = w
-            self.layout().addWidget(w)
-            w.hide()
+            listitem.opts = item
+            listitem.widget = None
+            self.listItems.append(listitem)
+            height = max(height, rowHeight * (len(list(item)) + 1))
 
+        self.setMinimumHeight(height)
         self.optionsList.setCurrentRow(0)
         self.setActiveWidget(self.optionsList.currentItem())
-        self.setMinimumHeight(height)
         width = self.optionsList.sizeHintForColumn(0) + 10
         self.optionsList.setMinimumWidth(width)
         self.optionsList.setMaximumWidth(width)
         self.optionsList.currentItemChanged.connect(self.setActiveWidget)
-        self.optionsList.setSizePolicy(QtGui.QSizePolicy.Fixed,
-                                       QtGui.QSizePolicy.Preferred)
+        self.optionsList.setSizePolicy(QtWidgets.QSizePolicy.Fixed,
+                                       QtWidgets.QSizePolicy.Preferred)
 
     def setActiveWidget(self, listitem):
         if self.activeOptionWidget is not None:
             self.activeOptionWidget.hide()
 
+        if listitem.widget is None:
+            w = OptionsWidget(listitem.opts)
+            w.updateVisibility(self.level, self.conf)
+            self.layout().addWidget(w)
+            self.setMinimumHeight(max(self.minimumHeight(),
+                                      w.minimumSizeHint().height()))
+            listitem.widget = w
+
         self.activeOptionWidget = listitem.widget
         self.activeOptionWidget.show()
 
     def updateVisibility(self, level=None):
         if level is not None:
             self.level = level
-        for listitem, w in self.optionWidgets:
-            visible, enabled = w.updateVisibility(self.level, self.conf)
+        for listitem in self.listItems:
+            if listitem.widget is not None:
+                visible, enabled = listitem.widget.updateVisibility(self.level,
+                                                                    self.conf)
+            else:
+                visible, enabled = OptionsWidget.checkVisibility(
+                    listitem.opts, self.level, self.conf)
             listitem.setHidden(not visible or not enabled)
 
 
-class SolverWidget(QtGui.QWidget):
+class SolverWidget(QtWidgets.QWidget):
     """ Widget used to run and monitor the Ember solver """
     def __init__(self, conf, *args, **kwargs):
-        QtGui.QWidget.__init__(self)
+        QtWidgets.QWidget.__init__(self)
+
+        # matplotlib is only loaded once a SolverWidget is created. The QtAgg
+        # backend uses whichever Qt binding has already been imported.
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
 
         self.conf = conf
-        self.setLayout(QtGui.QVBoxLayout())
+        self.setLayout(QtWidgets.QVBoxLayout())
 
         # Buttons
-        self.startButton = QtGui.QPushButton('Start')
-        self.stopButton = QtGui.QPushButton('Stop')
-        self.resetButton = QtGui.QPushButton('Reset')
-        self.buttons = QtGui.QWidget()
-        self.buttons.setLayout(QtGui.QHBoxLayout())
+        self.startButton = QtWidgets.QPushButton('Start')
+        self.stopButton = QtWidgets.QPushButton('Stop')
+        self.resetButton = QtWidgets.QPushButton('Reset')
+        self.buttons = QtWidgets.QWidget()
+        self.buttons.setLayout(QtWidgets.QHBoxLayout())
         self.buttons.layout().addWidget(self.startButton)
         self.buttons.layout().addWidget(self.stopButton)
         self.buttons.layout().addWidget(self.resetButton)
@@ -318,14 +408,14 @@ class SolverWidget(QtGui.QWidget):
         self.resetButton.pressed.connect(self.reset)
 
         # Progress Bar
-        self.progressBar = QtGui.QProgressBar()
+        self.progressBar = QtWidgets.QProgressBar()
         self.layout().addWidget(self.progressBar)
         self.progressBar.setRange(0, 1000)
         self.progressBar.setValue(0)
 
         # Graphs
-        self.graphContainer = QtGui.QWidget()
-        self.graphContainer.setLayout(QtGui.QHBoxLayout())
+        self.graphContainer = QtWidgets.QWidget()
+        self.graphContainer.setLayout(QtWidgets.QHBoxLayout())
         self.layout().addWidget(self.graphContainer)
 
         self.fig = Figure(figsize=(600,400), dpi=72)
@@ -333,7 +423,7 @@ class SolverWidget(QtGui.QWidget):
         self.ax1 = self.fig.add_subplot(1,2,1)
         self.ax1.set_xlabel('time [ms]')
         self.ax1.set_ylabel('Consumption Speed, $S_c$ [cm/s]')
-        self.Sc_timeseries = self.ax1.plot([0],[0], lw=2)[0]
+        self.Sc_timeseries = self.ax1.plot([0],[0], lw=2, animated=True)[0]
 
         self.ax2a = self.fig.add_subplot(1,2,2)
         self.ax2b = self.ax2a.twinx()
@@ -341,10 +431,16 @@ class SolverWidget(QtGui.QWidget):
         self.ax2a.set_ylabel('Temperature [K]')
         self.ax2b.set_ylabel('Heat Release Rate [MW/m$^3$]')
 
-        self.T_profile = self.ax2a.plot([0],[0], 'b', lw=2)[0]
-        self.hrr_profile = self.ax2b.plot([0],[0], 'r', lw=2)[0]
+        self.T_profile = self.ax2a.plot([0],[0], 'b', lw=2, animated=True)[0]
+        self.hrr_profile = self.ax2b.plot([0],[0], 'r', lw=2, animated=True)[0]
 
+        # The lines are animated so they can be redrawn by blitting them onto
+        # a saved background of each axes, which is captured in onDraw
         self.canvas = FigureCanvas(self.fig)
+        self.canvas.mpl_connect('draw_event', self.onDraw)
+        self._bg1 = None
+        self._bg2 = None
+        self._limits = {}
         self.graphContainer.layout().addWidget(self.canvas)
         bgcolor = self.palette().color(QtGui.QPalette.Window)
         self.fig.set_facecolor((bgcolor.redF(), bgcolor.greenF(), bgcolor.blueF()))
@@ -354,8 +450,11 @@ class SolverWidget(QtGui.QWidget):
         self.solver = None
         self.solverThread = None
         self.updateTimer = QtCore.QTimer()
-        self.updateTimer.setInterval(0.5)
+        self.updateTimer.setInterval(50) # milliseconds
         self.updateTimer.timeout.connect(self.updateStatus)
+        self.maxPlotPoints = 2000 # time series is downsampled beyond this
+        self._lastProgress = None
+        self._lastTime = None
         self.running = False
         self.updateButtons()
 
@@ -388,6 +487,9 @@ class SolverWidget(QtGui.QWidget):
         self.T_profile.set_data([0], [0])
         self.hrr_profile.set_data([0], [0])
         self.Sc_timeseries.set_data([0], [0])
+        self._limits = {}
+        self._lastProgress = None
+        self._lastTime = None
         self.canvas.draw()
         self.solver = None
         self.startButton.setText('Start')
@@ -408,29 +510,100 @@ class SolverWidget(QtGui.QWidget):
             self.updateTimer.stop()
             self.updateButtons()
 
-        if self.solver.progress > 0:
-            self.progressBar.setValue(1000 * self.solver.progress)
-        with self.solver.lock:
-            t = np.array(self.solver.timeseriesWriter.t)
-            Sc = np.array(self.solver.timeseriesWriter.Sc)
-
-            self.T_profile.set_data(self.solver.x * 1000,
-                                    self.solver.T)
-            self.hrr_profile.set_data(self.solver.x * 1000,
-                                      self.solver.qDot / 1e6)
-        self.Sc_timeseries.set_data(1000 * t, Sc * 100)
-
-        for ax in (self.ax1, self.ax2a, self.ax2b):
-            ax.relim()
-            ax.autoscale_view(False, True, True)
-        self.canvas.draw()
+        # Skip the update if the solver hasn't produced new output since the
+        # last one. The time series is updated by the solver thread between
+        # batches of steps, so neither check requires the solver lock.
+        progress = self.solver.progress
+        timeseries = self.solverThread.timeseries
+        tLast = timeseries[0,-1] if timeseries.shape[1] else None
+        if progress == self._lastProgress and tLast == self._lastTime:
+            return
+        self._lastProgress = progress
+        self._lastTime = tLast
 
+        if progress > 0:
+            self.progressBar.setValue(int(1000 * progress))
 
-class MainWindow(QtGui.QMainWindow):
+        # Only copy the data while holding the lock, so the solver thread
+        # isn't blocked while the plots are updated. The profile properties
+        # of FlameSolver already return copies.
+        with self.solver.lock:
+            x = self.solver.x
+            T = self.solver.T
+            qDot = self.solver.qDot
+
+        x *= 1000
+        qDot /= 1e6
+        # Plot evenly spaced points from long time series so that the cost of
+        # each update doesn't grow with the length of the simulation
+        N = timeseries.shape[1]
+        if N > self.maxPlotPoints:
+            index = np.linspace(0, N - 1, self.maxPlotPoints).astype(int)
+            timeseries = timeseries[:,index]
+
+        t, Sc = timeseries
+        self.T_profile.set_data(x, T)
+        self.hrr_profile.set_data(x, qDot)
+        self.Sc_timeseries.set_data(t, Sc)
+
+        rescaled = self.expandLimits(self.ax1, t, Sc)
+        rescaled |= self.expandLimits(self.ax2a, x, T)
+        rescaled |= self.expandLimits(self.ax2b, x, qDot)
+
+        if self._bg1 is None or rescaled:
+            # Axes and ticks need to be redrawn
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self._bg1)
+            self.ax1.draw_artist(self.Sc_timeseries)
+            self.canvas.blit(self.ax1.bbox)
+
+            # ax2a and ax2b share a bounding box
+            self.canvas.restore_region(self._bg2)
+            self.ax2a.draw_artist(self.T_profile)
+            self.ax2b.draw_artist(self.hrr_profile)
+            self.canvas.blit(self.ax2a.bbox)
+
+    def expandLimits(self, ax, x, y):
+        """
+        Fit the limits of *ax* to the data (*x*, *y*) if the data doesn't fit
+        within the current limits. Returns True if the limits were changed.
+        This avoids the cost of recomputing the data limits for each line with
+        Axes.relim() on every update.
+        """
+        if not len(x):
+            return False
+
+        xmin, xmax, ymin, ymax = x.min(), x.max(), y.min(), y.max()
+        if not np.isfinite((xmin, xmax, ymin, ymax)).all():
+            return False
+
+        old = self._limits.get(ax)
+        if (old is not None and old[0] <= xmin and xmax <= old[1] and
+            old[2] <= ymin and ymax <= old[3]):
+            return False
+
+        x0, x1 = _paddedRange(xmin, xmax)
+        y0, y1 = _paddedRange(ymin, ymax)
+        ax.set_xlim(x0, x1)
+        ax.set_ylim(y0, y1)
+        self._limits[ax] = (x0, x1, y0, y1)
+        return True
+
+    def onDraw(self, event):
+        """ Save the plot backgrounds after a full redraw of the figure """
+        self._bg1 = self.canvas.copy_from_bbox(self.ax1.bbox)
+        self._bg2 = self.canvas.copy_from_bbox(self.ax2a.bbox)
+        self.ax1.draw_artist(self.Sc_timeseries)
+        self.ax2a.draw_artist(self.T_profile)
+        self.ax2b.draw_artist(self.hrr_profile)
+
+
+class MainWindow(QtWidgets.QMainWindow):
     def __init__(self, *args, **kwargs):
-        QtGui.QMainWindow.__init__(self)
+        QtWidgets.QMainWindow.__init__(self)
 
-        w = QtGui.QWidget()
+        w = QtWidgets.QWidget()
         self.setCentralWidget(w)
         self.resize(800,600)
         self.setWindowTitle('Simple')
@@ -444,7 +617,7 @@ class MainWindow(QtGui.QMainWindow):
         self.addToMenu(fileMenu, 'Save &as...', lambda: self.saveConf(False))
         self.addToMenu(fileMenu, '&Quit', self.close)
 
-        optLevelGroup = QtGui.QActionGroup(optMenu)
+        optLevelGroup = QActionGroup(optMenu)
         a = self.addToMenu(optMenu, '&Basic',
                            lambda: self.setLevel(0), optLevelGroup)
         self.addToMenu(optMenu, '&Advanced',
@@ -461,7 +634,7 @@ class MainWindow(QtGui.QMainWindow):
             self.new()
 
     def addToMenu(self, menu, name, triggerFunc, group=None):
-        a = QtGui.QAction(name, self)
+        a = QAction(name, self)
         a.triggered.connect(triggerFunc)
         menu.addAction(a)
         if group:
@@ -492,7 +665,7 @@ class MainWindow(QtGui.QMainWindow):
             self.conf = localenv['conf']
             self.confFileName = conf
 
-        self.tabWidget = QtGui.QTabWidget()
+        self.tabWidget = QtWidgets.QTabWidget()
         self.setCentralWidget(self.tabWidget)
 
         self.confWidget = MultiOptionsWidget(self.conf)
@@ -502,10 +675,10 @@ class MainWindow(QtGui.QMainWindow):
         self.runWidget = SolverWidget(self.conf)
         self.tabWidget.addTab(self.runWidget, 'Run')
 
-        self.tabWidget.addTab(QtGui.QWidget(), 'Analyze') #TODO: unimplemented
+        self.tabWidget.addTab(QtWidgets.QWidget(), 'Analyze') #TODO: unimplemented
 
     def openConf(self):
-        fileinfo = QtGui.QFileDialog.getOpenFileName(
+        fileinfo = QtWidgets.QFileDialog.getOpenFileName(
             self, 'Select Configuration', '.', 'Flame Configurations (*.py *.conf)')
 
         # Dealing with an incompatibility between PySide and PyQt
@@ -515,8 +688,14 @@ class MainWindow(QtGui.QMainWindow):
             self.new(filename)
 
     def saveConf(self, useExisting):
+        # Option values are only updated when editing finishes, so make sure
+        # a field that is still being edited loses focus before saving
+        focused = QtWidgets.QApplication.focusWidget()
+        if focused is not None:
+            focused.clearFocus()
+
         if not useExisting or self.confFileName is None:
-            fileinfo = QtGui.QFileDialog.getSaveFileName(
+            fileinfo = QtWidgets.QFileDialog.getSaveFileName(
                         self, 'Select Configuration', '.', 'Flame Configurations (*.py *.conf)')
 
             # Dealing with an incompatibility between PySide and PyQt
@@ -530,13 +709,13 @@ class MainWindow(QtGui.QMainWindow):
 
             # Confirm before overwriting an existing file
             if os.path.exists(filename) and not useExisting:
-                dlg = QtGui.QMessageBox(self.parent())
+                dlg = QtWidgets.QMessageBox(self.parent())
                 dlg.setText("A file named '%s' already exists." % filename)
                 dlg.setInformativeText("Do you wish to overwrite it?")
                 dlg.setStandardButtons(dlg.Yes | dlg.No)
                 dlg.setDefaultButton(dlg.Yes)
 
-                ret = dlg.exec_()
+                ret = dlg.exec()
                 if ret == dlg.No:
                     self.saveConf(False)
                     return
@@ -552,9 +731,9 @@ class MainWindow(QtGui.QMainWindow):
 
 
 def main():
-    app = QtGui.QApplication(sys.argv)
-    app.setStyle("Plastique")
+    app = QtWidgets.QApplication(sys.argv)
+    app.setStyle("Fusion")
     window = MainWindow(*sys.argv)
     window.show()
 
-    sys.exit(app.exec_())
+    sys.exit(app.exec())